@@ -772,7 +772,7 @@ class IoTAMQTTClient(mqtt.Client):
 
             # create message for command acknowledgement
             elif attribute_name is None and command_name:
-                assert isinstance(payload, Dict), "Payload must be a dictionary"
+                assert isinstance(payload, dict), "Payload must be a dictionary"
                 assert len(payload.keys()) == 1, \
                     "Cannot acknowledge multiple commands simultaneously"
                 assert next(iter(payload.keys())) in \
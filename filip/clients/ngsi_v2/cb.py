@@ -23,6 +23,8 @@ from filip.models.ngsi_v2.context import (
     ContextEntity,
     ContextEntityKeyValues,
     ContextAttribute,
+    ENTITY_LIST_ADAPTER,
+    ENTITY_KEY_VALUES_LIST_ADAPTER,
     NamedCommand,
     NamedContextAttribute,
     Query,
@@ -403,11 +405,9 @@ class ContextBrokerClient(BaseHttpClient):
                 headers=headers,
             )
             if AttrsFormat.NORMALIZED in response_format:
-                adapter = TypeAdapter(List[ContextEntity])
-                return adapter.validate_python(items)
+                return ENTITY_LIST_ADAPTER.validate_python(items)
             if AttrsFormat.KEY_VALUES in response_format:
-                adapter = TypeAdapter(List[ContextEntityKeyValues])
-                return adapter.validate_python(items)
+                return ENTITY_KEY_VALUES_LIST_ADAPTER.validate_python(items)
             return items
 
         except requests.RequestException as err:
@@ -1775,11 +1775,9 @@ class ContextBrokerClient(BaseHttpClient):
                 limit=limit,
             )
             if response_format == AttrsFormat.NORMALIZED:
-                adapter = TypeAdapter(List[ContextEntity])
-                return adapter.validate_python(items)
+                return ENTITY_LIST_ADAPTER.validate_python(items)
             if response_format == AttrsFormat.KEY_VALUES:
-                adapter = TypeAdapter(List[ContextEntityKeyValues])
-                return adapter.validate_python(items)
+                return ENTITY_KEY_VALUES_LIST_ADAPTER.validate_python(items)
             return items
         except requests.RequestException as err:
             msg = "Query operation failed!"
@@ -26,12 +26,13 @@ from pydantic import (
     ValidationInfo,
 )
 
-from typing import Union, Optional, Pattern, List, Dict, Any
+from typing import Union, Optional, Pattern, List, Dict, Any, Callable
 
 from filip.models.base import DataType
 from filip.models.ngsi_v2.units import validate_unit_data, Unit
 from filip.utils.simple_ql import QueryString, QueryStatement
 from filip.utils.validators import (
+    is_json_serializable,
     validate_escape_character_free,
     validate_fiware_datatype_string_protect,
     validate_fiware_datatype_standard,
@@ -195,6 +196,21 @@ class AttrsFormat(str, Enum):
     )
 
 
+# Casts for the primitive attribute types that are applied to the value
+# (or each item of a list value) in `BaseValueAttribute`
+_VALUE_TYPE_CASTS: Dict[DataType, Callable[[Any], Any]] = {
+    DataType.TEXT: str,
+    DataType.BOOLEAN: bool,
+    DataType.NUMBER: float,
+    DataType.FLOAT: float,
+    DataType.INTEGER: int,
+}
+
+
+# Names of metadata that describe units, compared case-insensitive
+_UNIT_METADATA_NAMES = frozenset(("unit", "unittext", "unitcode"))
+
+
 # NGSIv2 entity models
 class Metadata(BaseModel):
     """
@@ -225,7 +241,8 @@ class Metadata(BaseModel):
 
     @field_validator("value")
     def validate_value(cls, value, info: ValidationInfo):
-        assert json.dumps(value), "metadata not serializable"
+        if not is_json_serializable(value):
+            raise ValueError("metadata not serializable")
 
         if info.data.get("type").casefold() == "unit":
             value = Unit.model_validate(value)
@@ -252,14 +269,9 @@ class NamedMetadata(Metadata):
 
     @model_validator(mode="after")
     def validate_data(self):
-        if self.model_dump().get("name", "").casefold() in [
-            "unit",
-            "unittext",
-            "unitcode",
-        ]:
-            valide_dict = self.model_dump()
-            valide_dict.update(validate_unit_data(self.model_dump()))
-            return self
+        if self.name.casefold() in _UNIT_METADATA_NAMES:
+            # raises if the unit data is invalid
+            validate_unit_data(self.model_dump())
         return self
 
     def to_context_metadata(self):
@@ -312,7 +324,7 @@ class BaseAttribute(BaseModel):
             Dict[str, Dict[str, str]],
         ]
     ] = Field(
-        default={},
+        default_factory=dict,
         title="Metadata",
         description="optional metadata describing properties of the attribute "
         "value like e.g. accuracy, provider, or a timestamp",
@@ -322,6 +334,8 @@ class BaseAttribute(BaseModel):
     @classmethod
     def validate_metadata_type(cls, value):
         """validator for field 'metadata'"""
+        if value is None:
+            return {}
         if type(value) == NamedMetadata:
             value = [value]
         elif isinstance(value, dict):
@@ -331,7 +345,7 @@ class BaseAttribute(BaseModel):
                     for key, item in value.items()
                 ]
             else:
-                json.dumps(value)
+                # serializability is checked by the metadata validators
                 value = [NamedMetadata(name=key, **item) for key, item in value.items()]
 
         if isinstance(value, list):
@@ -411,22 +425,11 @@ class BaseValueAttribute(BaseModel):
         validate_escape_character_free(value_)
 
         if value is not None:
-            if type_ == DataType.TEXT:
-                if isinstance(value, list):
-                    return [str(item) for item in value]
-                return str(value)
-            if type_ == DataType.BOOLEAN:
-                if isinstance(value, list):
-                    return [bool(item) for item in value]
-                return bool(value)
-            if type_ in (DataType.NUMBER, DataType.FLOAT):
-                if isinstance(value, list):
-                    return [float(item) for item in value]
-                return float(value)
-            if type_ == DataType.INTEGER:
+            cast = _VALUE_TYPE_CASTS.get(type_)
+            if cast is not None:
                 if isinstance(value, list):
-                    return [int(item) for item in value]
-                return int(value)
+                    return [cast(item) for item in value]
+                return cast(value)
             if type_ == DataType.DATETIME:
                 return value
             # allows list
@@ -437,8 +440,9 @@ class BaseValueAttribute(BaseModel):
             # allows dict and BaseModel as object
             if type_ == DataType.OBJECT:
                 if isinstance(value, dict):
-                    value = json.dumps(value)
-                    return json.loads(value)
+                    # the json round trip returns a normalized copy, e.g.
+                    # tuples become lists and keys become strings
+                    return json.loads(json.dumps(value))
                 elif isinstance(value, BaseModel):
                     value.model_dump_json()
                     return value
@@ -486,8 +490,7 @@ class BaseValueAttribute(BaseModel):
             # allows list, dict and BaseModel as structured value
             if type_ == DataType.STRUCTUREDVALUE:
                 if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                    return json.loads(value)
+                    return json.loads(json.dumps(value))
                 elif isinstance(value, BaseModel):
                     value.model_dump_json()
                     return value
@@ -502,7 +505,6 @@ class BaseValueAttribute(BaseModel):
 
             # if none of the above, check if serializable. Hence, no further
             # type check is performed
-            value = json.dumps(value)
-            return json.loads(value)
+            return json.loads(json.dumps(value))
 
         return value
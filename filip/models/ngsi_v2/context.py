@@ -1,16 +1,18 @@
 """
 NGSIv2 models for context broker interaction
 """
-import json
-from typing import Any, List, Dict, Union, Optional, Set, Tuple
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, List, Dict, Union, Optional, Set, Tuple, Type
 
 from aenum import Enum
 from pydantic import field_validator, ConfigDict, BaseModel, Field, \
-    model_validator
+    model_validator, TypeAdapter
 from pydantic_core.core_schema import ValidationInfo
 
 from filip.models.ngsi_v2.base import (
     EntityPattern,
+    Metadata,
     Expression,
     BaseAttribute,
     BaseValueAttribute,
@@ -18,10 +20,24 @@ from filip.models.ngsi_v2.base import (
 )
 from filip.models.base import DataType
 from filip.utils.validators import (
+    is_json_serializable,
     validate_fiware_datatype_standard,
     validate_fiware_datatype_string_protect,
 )
 
+# DataType is immutable, hence its members and values are only collected once
+_ALL_DATA_TYPES = tuple(DataType)
+_ALL_DATA_TYPE_VALUES = frozenset(att_type.value for att_type in DataType)
+
+
+def _copy_attribute_data(attr: BaseModel) -> Dict[str, Any]:
+    """
+    Returns an independent copy of the field values of an already validated
+    attribute. Changing the copy, e.g. its value or metadata, does not
+    change the attribute.
+    """
+    return deepcopy(dict(attr))
+
 
 class GetEntitiesOptions(str, Enum):
     """Options for queries"""
@@ -259,6 +275,65 @@ class ContextEntity(ContextEntityKeyValues):
 
         return attrs
 
+    @classmethod
+    def from_ngsi_dict(cls, data: Dict[str, Any], trusted: bool = True):
+        """
+        Create an entity from its normalized NGSI representation, e.g. a
+        response of the context broker.
+
+        If the data is trusted, the entity and its attributes are
+        constructed without validation. Hence, attribute values are not
+        casted to their attribute type and must already be in the
+        representation that is returned by the context broker.
+
+        Example::
+
+            >>> data = {'id': 'MyId',
+                        'type': 'MyType',
+                        'my_attr': {'value': 20, 'type': 'Number'}}
+
+            >>> entity = ContextEntity.from_ngsi_dict(data)
+
+        Args:
+            data: Entity in normalized NGSI representation
+            trusted: If False, the data is validated as usual
+
+        Returns:
+            Entity
+        """
+        if not trusted:
+            return cls.model_validate(data)
+
+        attrs = {}
+        for key, attr in data.items():
+            if key in ("id", "type"):
+                continue
+            if isinstance(attr, ContextAttribute):
+                attrs[key] = attr
+                continue
+            attr = dict(attr)
+            if attr.get("metadata"):
+                attr["metadata"] = {
+                    name: Metadata.model_construct(**metadata)
+                    for name, metadata in attr["metadata"].items()
+                }
+            attrs[key] = ContextAttribute.model_construct(**attr)
+        return cls.model_construct(id=data["id"], type=data["type"], **attrs)
+
+    @classmethod
+    def parse_list(cls, data: Union[str, bytes]) -> List["ContextEntity"]:
+        """
+        Parse and validate a json encoded list of entities, e.g. the raw
+        content of a context broker response, in a single pass.
+
+        Args:
+            data: json encoded list of entities
+
+        Returns:
+            List of entities
+        """
+        return _entity_list_adapter(cls).validate_json(data)
+
     @field_validator('*')
     @classmethod
     def check_attributes(cls, value, info: ValidationInfo):
@@ -302,16 +377,65 @@ class ContextEntity(ContextEntityKeyValues):
             attrs: Dict[str, ContextAttribute]: {NAME for attr : Attribute} or
                    List[NamedContextAttribute]
 
+        Raises:
+            ValidationError: if an attribute is no ContextAttribute or the
+                validation of the entity fails. In the latter case none of
+                the new attributes is added.
+
         Returns:
             None
         """
         if isinstance(attrs, list):
+            # the named attributes are already validated, hence the
+            # conversion can skip the validation. The data is copied so that
+            # the entity does not share values with the caller's attributes
             attrs = {
-                attr.name: ContextAttribute(**attr.model_dump(exclude={"name"}))
+                attr.name: ContextAttribute.model_construct(
+                    **{
+                        key: value
+                        for key, value in _copy_attribute_data(attr).items()
+                        if key != "name"
+                    }
+                )
                 for attr in attrs
             }
+        new_attrs = {}
         for key, attr in attrs.items():
-            self.__setattr__(name=key, value=attr)
+            if (
+                key in self.model_fields
+                or self.__pydantic_extra__ is None
+                or not isinstance(attr, ContextAttribute)
+            ):
+                # model fields and values that are no attributes are set as
+                # usual to run their validation
+                self.__setattr__(name=key, value=attr)
+                continue
+            new_attrs[key] = attr
+        if not new_attrs:
+            return
+        # The attributes are already validated. Hence, all but the last one
+        # are added at once and setting the last one runs the validators of
+        # the entity a single time for all of them. If these fail, none of
+        # the attributes is added.
+        *bulk, (last_key, last_attr) = new_attrs.items()
+        bulk = dict(bulk)
+        extra = self.__pydantic_extra__
+        previous = {key: extra[key] for key in new_attrs if key in extra}
+        unset = {
+            key for key in new_attrs if key not in self.__pydantic_fields_set__
+        }
+        extra.update(bulk)
+        self.__pydantic_fields_set__.update(bulk)
+        try:
+            self.__setattr__(name=last_key, value=last_attr)
+        except ValueError:
+            # the failed assignment may have replaced the extra dict
+            extra = self.__pydantic_extra__
+            for key in new_attrs:
+                extra.pop(key, None)
+            extra.update(previous)
+            self.__pydantic_fields_set__.difference_update(unset)
+            raise
 
     def get_attributes(
         self,
@@ -348,43 +472,54 @@ class ContextEntity(ContextEntityKeyValues):
         ), "Only whitelist or blacklist is allowed"
 
         if whitelisted_attribute_types is not None:
-            attribute_types = whitelisted_attribute_types
+            allowed_types = {att.value for att in whitelisted_attribute_types}
         elif blacklisted_attribute_types is not None:
-            attribute_types = [
-                att_type
-                for att_type in list(DataType)
+            allowed_types = {
+                att_type.value
+                for att_type in _ALL_DATA_TYPES
                 if att_type not in blacklisted_attribute_types
-            ]
+            }
         else:
-            attribute_types = [att_type for att_type in list(DataType)]
+            allowed_types = _ALL_DATA_TYPE_VALUES
 
+        # The attributes of the entity are already validated, hence they
+        # are copied via `model_construct` instead of being validated again.
+        # The returned attributes are independent copies.
         if response_format == PropertyFormat.DICT:
             if strict_data_type:
                 return {
-                    key: ContextAttribute(**value)
-                    for key, value in self.model_dump().items()
-                    if key not in ContextEntity.model_fields
-                    and value.get("type") in [att.value for att in attribute_types]
+                    key: ContextAttribute.model_construct(
+                        **_copy_attribute_data(value)
+                    )
+                    for key, value in self
+                    if key not in _CONTEXT_ENTITY_FIELDS
+                    and value.type in allowed_types
                 }
             else:
                 return {
-                    key: ContextAttribute(**value)
-                    for key, value in self.model_dump().items()
-                    if key not in ContextEntity.model_fields
+                    key: ContextAttribute.model_construct(
+                        **_copy_attribute_data(value)
+                    )
+                    for key, value in self
+                    if key not in _CONTEXT_ENTITY_FIELDS
                 }
         else:
             if strict_data_type:
                 return [
-                    NamedContextAttribute(name=key, **value)
-                    for key, value in self.model_dump().items()
-                    if key not in ContextEntity.model_fields
-                    and value.get("type") in [att.value for att in attribute_types]
+                    NamedContextAttribute.model_construct(
+                        name=key, **_copy_attribute_data(value)
+                    )
+                    for key, value in self
+                    if key not in _CONTEXT_ENTITY_FIELDS
+                    and value.type in allowed_types
                 ]
             else:
                 return [
-                    NamedContextAttribute(name=key, **value)
-                    for key, value in self.model_dump().items()
-                    if key not in ContextEntity.model_fields
+                    NamedContextAttribute.model_construct(
+                        name=key, **_copy_attribute_data(value)
+                    )
+                    for key, value in self
+                    if key not in _CONTEXT_ENTITY_FIELDS
                 ]
 
     def update_attribute(
@@ -423,9 +558,7 @@ class ContextEntity(ContextEntityKeyValues):
             Set[str]
         """
 
-        return {
-            key for key in self.model_dump() if key not in ContextEntity.model_fields
-        }
+        return {key for key, _ in self if key not in _CONTEXT_ENTITY_FIELDS}
 
     def delete_attributes(
         self,
@@ -445,17 +578,26 @@ class ContextEntity(ContextEntityKeyValues):
                        existing argument
         """
 
-        names: List[str] = []
+        if not attrs:
+            return
+
+        names: Set[str] = set()
         if isinstance(attrs, list):
             for entry in attrs:
                 if isinstance(entry, str):
-                    names.append(entry)
+                    names.add(entry)
                 elif isinstance(entry, NamedContextAttribute):
-                    names.append(entry.name)
+                    names.add(entry.name)
         else:
-            names.extend(list(attrs.keys()))
+            names.update(attrs.keys())
+
+        extra = self.__pydantic_extra__ or {}
         for name in names:
-            delattr(self, name)
+            if name in extra:
+                del extra[name]
+                self.__pydantic_fields_set__.discard(name)
+            else:
+                delattr(self, name)
 
     def get_attribute(self, attribute_name: str) -> NamedContextAttribute:
         """
@@ -470,9 +612,17 @@ class ContextEntity(ContextEntityKeyValues):
         Returns:
             NamedContextAttribute
         """
-        for attr in self.get_attributes():
-            if attr.name == attribute_name:
-                return attr
+        attr = None
+        if attribute_name not in _CONTEXT_ENTITY_FIELDS:
+            attr = self.__dict__.get(attribute_name)
+            if attr is None and self.model_extra:
+                attr = self.model_extra.get(attribute_name)
+        # only attributes of the pre-defined types are returned, which is
+        # the same behavior as in `get_attributes`
+        if attr is not None and attr.type in _ALL_DATA_TYPE_VALUES:
+            return NamedContextAttribute.model_construct(
+                name=attribute_name, **_copy_attribute_data(attr)
+            )
         raise KeyError(f"Attribute '{attribute_name}' not in entity")
 
     def get_properties(
@@ -616,6 +766,26 @@ class ContextEntity(ContextEntityKeyValues):
         return command, command_status, command_info
 
 
+# Names of the model fields of `ContextEntity` that are not attributes
+_CONTEXT_ENTITY_FIELDS = frozenset(ContextEntity.model_fields)
+
+
+@lru_cache(maxsize=256)
+def _entity_list_adapter(entity_class: Type[ContextEntity]) -> TypeAdapter:
+    """
+    Returns the adapter for validating a list of entities of the given
+    class. Building an adapter is expensive, hence it is only created once
+    per class.
+    """
+    return TypeAdapter(List[entity_class])
+
+
+# Adapters for validating lists of entities, e.g. context broker responses.
+# Building an adapter is expensive, hence they are only created once.
+ENTITY_LIST_ADAPTER = _entity_list_adapter(ContextEntity)
+ENTITY_KEY_VALUES_LIST_ADAPTER = TypeAdapter(List[ContextEntityKeyValues])
+
+
 class Query(BaseModel):
     """
     Model for queries
@@ -729,9 +899,7 @@ class Command(BaseModel):
         Returns:
             value
         """
-        try:
-            json.dumps(value)
-        except:
+        if not is_json_serializable(value):
             raise ValueError(f"Command value {value} " f"is not serializable")
         return value
 
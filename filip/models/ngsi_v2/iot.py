@@ -6,7 +6,7 @@ import logging
 import itertools
 import warnings
 from enum import Enum
-from typing import Any, Dict, Optional, List, Union
+from typing import Any, Dict, Iterable, Optional, List, Union
 import pytz
 from pydantic import field_validator, model_validator, ConfigDict, BaseModel, Field, AnyHttpUrl
 from filip.models.base import NgsiVersion, DataType
@@ -159,6 +159,15 @@ class StaticDeviceAttribute(IoTABaseAttribute, BaseValueAttribute):
     pass
 
 
+# Device field that holds the attributes of each attribute type
+_DEVICE_ATTRIBUTE_FIELDS = {
+    DeviceAttribute: 'attributes',
+    LazyDeviceAttribute: 'lazy',
+    StaticDeviceAttribute: 'static_attributes',
+    DeviceCommand: 'commands'
+}
+
+
 class ServiceGroup(BaseModel):
     """
     Model for device service group.
@@ -520,6 +529,43 @@ class Device(DeviceSettings):
                              attribute.model_dump_json(indent=2))
                 raise
 
+    def add_attributes(self,
+                       attributes: Iterable[Union[DeviceAttribute,
+                                                  LazyDeviceAttribute,
+                                                  StaticDeviceAttribute,
+                                                  DeviceCommand]],
+                       update: bool = False) -> None:
+        """
+        Adds several attributes at once. Other than calling add_attribute
+        for each of them, every attribute list of the device is only
+        assigned, and hence validated, once.
+
+        Args:
+            attributes: Attributes to add to device configuration
+            update (bool): If 'True' and an attribute does already exists
+                tries to update the attribute if not
+        Returns:
+            None
+        """
+        new_values: Dict[str, List] = {}
+        for attribute in attributes:
+            field = _DEVICE_ATTRIBUTE_FIELDS.get(type(attribute))
+            if field is not None:
+                values = new_values.setdefault(field,
+                                               list(getattr(self, field)))
+                if attribute not in values:
+                    values.append(attribute)
+                    continue
+            # existing attributes and unknown types are handled by
+            # add_attribute, after adding the attributes collected so far
+            for name, values in new_values.items():
+                self.__setattr__(name=name, value=values)
+            new_values = {}
+            self.add_attribute(attribute=attribute, update=update)
+
+        for name, values in new_values.items():
+            self.__setattr__(name=name, value=values)
+
     def update_attribute(self,
                          attribute: Union[DeviceAttribute,
                                           LazyDeviceAttribute,
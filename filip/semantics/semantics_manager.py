@@ -315,7 +315,7 @@ class SemanticsManager(BaseModel):
 
             entity_field_value = entity.get_attribute(field_name).value
 
-            if isinstance(entity_field_value, List):
+            if isinstance(entity_field_value, list):
                 values = entity_field_value
             else:
                 values = [entity_field_value]
@@ -3,9 +3,10 @@ Code generator for data models from schema.json descriptions
 """
 import json
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Union, Dict, Any, Type
+from typing import Union, Dict, Any, Type, Tuple
 from urllib import parse
 from uuid import uuid4
 from datamodel_code_generator import InputFileType, generate, ParseResult
@@ -88,6 +89,23 @@ def create_data_model_file(*,
         shutil.move(str(output), str(path))
 
 
+@lru_cache(maxsize=256)
+def _create_context_entity_model(name: str,
+                                 attribute_names: Tuple[str, ...]) -> \
+        Type['ContextEntity']:
+    """
+    Creates the ContextEntity-Model for the given attribute names. The
+    result is cached because creating a model is expensive and the same
+    data structure is often used many times.
+    """
+    properties = {key: (ContextAttribute, ...) for key in attribute_names}
+    return create_model(
+        __model_name=name,
+        __base__=ContextEntity,
+        **properties
+    )
+
+
 def create_context_entity_model(name: str = None,
                                 data: Dict = None,
                                 validators: Dict[str, Any] = None,
@@ -96,6 +114,11 @@ def create_context_entity_model(name: str = None,
     r"""
     Creates a ContextEntity-Model from a dict:
 
+    Note:
+        Without validators the generated models are cached. Hence, calls
+        with the same name and the same attribute names return the very
+        same class, and changes to that class affect all callers.
+
     Args:
         name:
             name of the model
@@ -126,14 +149,20 @@ def create_context_entity_model(name: str = None,
         ContextEntity
 
     """
-    properties = {key: (ContextAttribute, ...) for key in data.keys() if
-                  key not in ContextEntity.model_fields}
-    model = create_model(
-        __model_name=name or 'GeneratedContextEntity',
-        __base__=ContextEntity,
-        __validators__=validators or {},
-        **properties
-    )
+    name = name or 'GeneratedContextEntity'
+    attribute_names = tuple(key for key in data.keys() if
+                            key not in ContextEntity.model_fields)
+    if validators:
+        # validators are not hashable, hence these models are not cached
+        properties = {key: (ContextAttribute, ...) for key in attribute_names}
+        model = create_model(
+            __model_name=name,
+            __base__=ContextEntity,
+            __validators__=validators,
+            **properties
+        )
+    else:
+        model = _create_context_entity_model(name, attribute_names)
 
     # if path exits a file will be generated that contains the model
     if path:
@@ -224,7 +224,7 @@ class QueryString:
         returns:
             List of QueryStatements
         """
-        if isinstance(qs, List):
+        if isinstance(qs, list):
             for idx, item in enumerate(qs):
                 if not isinstance(item, QueryStatement):
                     qs[idx] = QueryStatement(*item)
@@ -1,11 +1,13 @@
 """
 Helper functions to prohibit boiler plate code
 """
+import json
 import logging
 import re
 import warnings
 from aenum import Enum
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Any, FrozenSet, Pattern, Union
 from pydantic import AnyHttpUrl, validate_call
 from pydantic_core import PydanticCustomError
 from filip.custom_types import AnyMqttUrl
@@ -33,6 +35,16 @@ class FiwareRegex(str, Enum):
                      "AND the strings: id, type, geo:location"
 
 
+# Patterns are compiled once at import, since the validators using them
+# are called for every validated field
+_FIWARE_STANDARD_REGEX = re.compile(FiwareRegex.standard.value)
+_FIWARE_STRING_PROTECT_REGEX = re.compile(FiwareRegex.string_protect.value)
+_FIWARE_SERVICE_PATH_REGEX = re.compile(
+    r'^((\/\w*)|(\/\#))*(\,((\/\w*)|(\/\#)))*$')
+_FIWARE_SERVICE_REGEX = re.compile(r"\w*$")
+_MQTT_TOPIC_REGEX = re.compile(r'^((?![\'\"#+,])[\x00-\x7F])*$')
+
+
 @validate_call
 def validate_http_url(url: AnyHttpUrl) -> str:
     """
@@ -79,18 +91,18 @@ def validate_escape_character_free(value: Any) -> Any:
        validated string
     """
 
-    if not isinstance(value, List):
+    if not isinstance(value, list):
         values = [value]
     else:
         values = value
 
     for value in values:
-        if isinstance(value, Dict):
+        if isinstance(value, dict):
             for key, dict_value in value.items():
                 validate_escape_character_free(dict_value)
                 # it seems Fiware has no problem if the keys contain ' or "
                 # validate_escape_character_free(key)
-        elif isinstance(value, List):
+        elif isinstance(value, list):
             for inner_list in value:
                 validate_escape_character_free(inner_list)
         else:
@@ -105,13 +117,34 @@ def validate_escape_character_free(value: Any) -> Any:
     return values
 
 
-def match_regex(value: str, pattern: str):
+def is_json_serializable(value: Any) -> bool:
+    """
+    Function that checks whether a value is json serializable.
+    Primitive values are accepted directly, all other values are checked by
+    serializing them.
+
+    Args:
+        value: the value to check
+
+    Returns:
+        True if the value is json serializable, False otherwise
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return True
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def match_regex(value: str, pattern: Union[str, Pattern]):
     regex = re.compile(pattern)
     if not regex.match(value):
         raise PydanticCustomError(
             'string_pattern_mismatch',
             "String should match pattern '{pattern}'",
-            {'pattern': pattern},
+            {'pattern': regex.pattern},
         )
     return value
 
@@ -125,16 +158,26 @@ def ignore_none_input(func):
 
 
 def validate_fiware_standard_regex(vale: str):
-    return match_regex(vale, FiwareRegex.standard.value)
+    return match_regex(vale, _FIWARE_STANDARD_REGEX)
 
 
 def validate_fiware_string_protect_regex(vale: str):
-    return match_regex(vale, FiwareRegex.string_protect.value)
+    return match_regex(vale, _FIWARE_STRING_PROTECT_REGEX)
 
 
 @ignore_none_input
 def validate_mqtt_topic(topic: str):
-    return match_regex(topic, r'^((?![\'\"#+,])[\x00-\x7F])*$')
+    return match_regex(topic, _MQTT_TOPIC_REGEX)
+
+
+@lru_cache(maxsize=None)
+def _data_type_values() -> FrozenSet[str]:
+    """
+    Values of all DataTypes. All of them are FIWARE safe, hence a type
+    matching one of them does not need to be checked against the regex.
+    """
+    from filip.models.base import DataType
+    return frozenset(data_type.value for data_type in DataType)
 
 
 @ignore_none_input
@@ -143,6 +186,8 @@ def validate_fiware_datatype_standard(_type):
     if isinstance(_type, DataType):
         return _type
     elif isinstance(_type, str):
+        if _type in _data_type_values():
+            return _type
         return validate_fiware_standard_regex(_type)
     else:
         raise TypeError(f"Invalid type {type(_type)}")
@@ -154,6 +199,8 @@ def validate_fiware_datatype_string_protect(_type):
     if isinstance(_type, DataType):
         return _type
     elif isinstance(_type, str):
+        if _type in _data_type_values():
+            return _type
         return validate_fiware_string_protect_regex(_type)
     else:
         raise TypeError(f"Invalid type {type(_type)}")
@@ -161,14 +208,12 @@ def validate_fiware_datatype_string_protect(_type):
 
 @ignore_none_input
 def validate_fiware_service_path(service_path):
-    return match_regex(service_path,
-                       r'^((\/\w*)|(\/\#))*(\,((\/\w*)|(\/\#)))*$')
+    return match_regex(service_path, _FIWARE_SERVICE_PATH_REGEX)
 
 
 @ignore_none_input
 def validate_fiware_service(service):
-    return match_regex(service,
-                       r"\w*$")
+    return match_regex(service, _FIWARE_SERVICE_REGEX)
 
 
 jexl_transformation_functions = {
@@ -3,9 +3,11 @@ Test for filip.core.client
 """
 import unittest
 import json
+import os
 import requests
 
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 
 from filip.models.base import FiwareHeader
 from filip.clients.ngsi_v2.client import HttpClient
@@ -18,19 +20,35 @@ class TestClient(unittest.TestCase):
     Test case for global client
     """
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Setup test data once for all tests. The tests only read the config,
+        hence it is shared between them. The same holds for the session
+        that keeps the connections to the servers alive between tests.
+        Returns:
+            None
+        """
+        cls.create_json_file()
+        with open(cls.get_json_path()) as f:
+            cls.config = json.load(f)
+        cls.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        cls.session.mount("http://", adapter)
+        cls.session.mount("https://", adapter)
+
     def setUp(self) -> None:
         """
-        Setup test data
+        Setup test data. The header is changed by the tests, hence it is
+        created for each test.
         Returns:
             None
         """
         self.fh = FiwareHeader(service=settings.FIWARE_SERVICE,
                                service_path=settings.FIWARE_SERVICEPATH)
-        self.create_json_file()
-        with open(self.get_json_path()) as f:
-            self.config = json.load(f)
 
-    def create_json_file(self) -> None:
+    @classmethod
+    def create_json_file(cls) -> None:
         """
         Create a json settings file based on the current environment settings
         """
@@ -39,7 +57,7 @@ class TestClient(unittest.TestCase):
           "iota_url": str(settings.IOTA_JSON_URL),
           "ql_url": str(settings.QL_URL)
         }
-        with open(self.get_json_path(), "w") as file:
+        with open(cls.get_json_path(), "w") as file:
             file.write(json.dumps(content, indent=4))
 
     @staticmethod
@@ -52,6 +70,11 @@ class TestClient(unittest.TestCase):
         # Match the needed path to the config file in both cases
 
         path = Path(__file__).parent.resolve()
+        # parallel test workers (pytest-xdist) each use their own file, as
+        # the test class may be split across them
+        worker = os.environ.get("PYTEST_XDIST_WORKER")
+        if worker:
+            return str(path.joinpath(f'test_ngsi_v2_client_{worker}.json'))
         return str(path.joinpath('test_ngsi_v2_client.json'))
 
     @staticmethod
@@ -121,7 +144,9 @@ class TestClient(unittest.TestCase):
         client.timeseries.get_version()
 
     def test_config_dict(self):
-        client = HttpClient(config=self.config, fiware_header=self.fh)
+        client = HttpClient(config=self.config,
+                            session=self.session,
+                            fiware_header=self.fh)
         self._test_connections(client=client)
         self._test_change_of_headers(client=client)
 
@@ -132,7 +157,9 @@ class TestClient(unittest.TestCase):
 
         """
         config_path = Path(self.get_json_path())
-        client = HttpClient(config=config_path, fiware_header=self.fh)
+        client = HttpClient(config=config_path,
+                            session=self.session,
+                            fiware_header=self.fh)
         self._test_connections(client=client)
         self._test_change_of_headers(client=client)
 
@@ -196,10 +223,24 @@ class TestClient(unittest.TestCase):
             None
         """
 
-        # remove create json and env config file
-        import os
-        os.remove(self.get_json_path())
+        # remove created env config file
         try:
             os.remove(self.get_env_path())
         except:
             pass
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Clean up artifacts of the test class
+
+        Returns:
+            None
+        """
+
+        # remove created json config file
+        try:
+            os.remove(cls.get_json_path())
+        except FileNotFoundError:
+            pass
+        cls.session.close()
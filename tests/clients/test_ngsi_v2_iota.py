@@ -6,6 +6,8 @@ import unittest
 import logging
 import requests
 
+from requests.adapters import HTTPAdapter
+from typing import Callable, List
 from uuid import uuid4
 
 from filip.models.base import FiwareHeader, DataType
@@ -19,59 +21,105 @@ from filip.models.ngsi_v2.iot import \
     DeviceCommand, \
     LazyDeviceAttribute, \
     StaticDeviceAttribute, ExpressionLanguage
-from filip.utils.cleanup import clear_all, clean_test
+from filip.utils.cleanup import clear_all
 from tests.config import settings
 
 logger = logging.getLogger(__name__)
 
+# device fields that are set by the agent and hence not compared
+_DEVICE_COMPARE_EXCLUDE = frozenset({'service', 'service_path', 'timezone'})
+
+# device used by the tests, tests must not modify it
+_DEVICE = {
+    "device_id": "test_device",
+    "service": settings.FIWARE_SERVICE,
+    "service_path": settings.FIWARE_SERVICEPATH,
+    "entity_name": "test_entity",
+    "entity_type": "test_entity_type",
+    "timezone": 'Europe/Berlin',
+    "timestamp": None,
+    "apikey": "1234",
+    "endpoint": None,
+    "transport": 'HTTP',
+    "expressionLanguage": ExpressionLanguage.JEXL
+}
+
+
+class TestAgentOffline(unittest.TestCase):
+    """
+    Tests of the IoTA models that do not need a running IoT-Agent
+    """
+    device = _DEVICE
+
+    def test_service_group_model(self):
+        pass
+
+    def test_device_model(self):
+        device = Device(**self.device)
+        self.assertEqual(self.device,
+                         device.model_dump(exclude_unset=True))
+
 
 class TestAgent(unittest.TestCase):
 
-    def setUp(self) -> None:
-        self.fiware_header = FiwareHeader(
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Setup clients and fixtures that are shared by all tests. Hence, the
+        connections of their session are kept alive between the tests.
+        """
+        cls.fiware_header = FiwareHeader(
             service=settings.FIWARE_SERVICE,
             service_path=settings.FIWARE_SERVICEPATH)
-        clear_all(fiware_header=self.fiware_header,
+        cls.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        cls.session.mount(str(settings.IOTA_JSON_URL), adapter)
+        cls.session.mount(str(settings.CB_URL), adapter)
+        cls.client = IoTAClient(url=settings.IOTA_JSON_URL,
+                                session=cls.session,
+                                fiware_header=cls.fiware_header)
+        cls.cb_client = ContextBrokerClient(url=settings.CB_URL,
+                                            session=cls.session,
+                                            fiware_header=cls.fiware_header)
+        clear_all(fiware_header=cls.fiware_header,
                   cb_url=settings.CB_URL,
                   iota_url=settings.IOTA_JSON_URL)
-        self.service_group1 = ServiceGroup(entity_type='Thing',
-                                           resource='/iot/json',
-                                           apikey=str(uuid4()))
-        self.service_group2 = ServiceGroup(entity_type='OtherThing',
-                                           resource='/iot/json',
-                                           apikey=str(uuid4()))
-        self.device = {
-            "device_id": "test_device",
-            "service": self.fiware_header.service,
-            "service_path": self.fiware_header.service_path,
-            "entity_name": "test_entity",
-            "entity_type": "test_entity_type",
-            "timezone": 'Europe/Berlin',
-            "timestamp": None,
-            "apikey": "1234",
-            "endpoint": None,
-            "transport": 'HTTP',
-            "expressionLanguage": ExpressionLanguage.JEXL
-        }
-        self.client = IoTAClient(
-            url=settings.IOTA_JSON_URL,
-            fiware_header=self.fiware_header)
+        # read-only fixtures, tests must not modify them
+        cls.service_group1 = ServiceGroup(entity_type='Thing',
+                                          resource='/iot/json',
+                                          apikey=str(uuid4()))
+        cls.service_group2 = ServiceGroup(entity_type='OtherThing',
+                                          resource='/iot/json',
+                                          apikey=str(uuid4()))
+        cls.device = _DEVICE
+        cls.attr = DeviceAttribute.model_construct(name='temperature',
+                                                   object_id='t',
+                                                   type='Number',
+                                                   entity_name='test')
+        cls.attr_command = DeviceCommand.model_construct(name='open')
+        # lazy attributes only have a name and a type, model_construct
+        # would keep any other argument
+        cls.attr_lazy = LazyDeviceAttribute.model_construct(name='pressure',
+                                                            type='Text')
+        cls.attr_static = StaticDeviceAttribute.model_construct(
+            name='hasRoom',
+            type='Relationship',
+            value='my_partner_id')
 
-    def test_get_version(self):
-        with IoTAClient(
-                url=settings.IOTA_JSON_URL,
-                fiware_header=self.fiware_header) as client:
-            self.assertIsNotNone(client.get_version())
+    def setUp(self) -> None:
+        # devices and service groups created by a test, these are removed
+        # again in tearDown
+        self._created_devices: List[Device] = []
+        self._created_groups: List[ServiceGroup] = []
 
-    def test_service_group_model(self):
-        pass
+    def test_get_version(self):
+        self.assertIsNotNone(self.client.get_version())
 
-    @clean_test(fiware_service=settings.FIWARE_SERVICE,
-                fiware_servicepath=settings.FIWARE_SERVICEPATH,
-                iota_url=settings.IOTA_JSON_URL)
     def test_service_group_endpoints(self):
         self.client.post_groups(service_groups=[self.service_group1,
                                                 self.service_group2])
+        self._created_groups.extend([self.service_group1,
+                                     self.service_group2])
         groups = self.client.get_group_list()
         with self.assertRaises(requests.RequestException):
             self.client.post_groups(groups, update=False)
@@ -79,58 +127,31 @@ class TestAgent(unittest.TestCase):
         self.client.get_group(resource=self.service_group1.resource,
                               apikey=self.service_group1.apikey)
 
-    def test_device_model(self):
-        device = Device(**self.device)
-        self.assertEqual(self.device,
-                         device.model_dump(exclude_unset=True))
-
-    @clean_test(fiware_service=settings.FIWARE_SERVICE,
-                fiware_servicepath=settings.FIWARE_SERVICEPATH,
-                cb_url=settings.CB_URL,
-                iota_url=settings.IOTA_JSON_URL)
     def test_device_endpoints(self):
         """
         Test device creation
         """
-        with IoTAClient(
-                url=settings.IOTA_JSON_URL,
-                fiware_header=self.fiware_header) as client:
-            client.get_device_list()
-            device = Device(**self.device)
-
-            attr = DeviceAttribute(name='temperature',
-                                   object_id='t',
-                                   type='Number',
-                                   entity_name='test')
-            attr_command = DeviceCommand(name='open')
-            attr_lazy = LazyDeviceAttribute(name='pressure',
-                                            object_id='p',
-                                            type='Text',
-                                            entity_name='pressure')
-            attr_static = StaticDeviceAttribute(name='hasRoom',
-                                                type='Relationship',
-                                                value='my_partner_id')
-            device.add_attribute(attr)
-            device.add_attribute(attr_command)
-            device.add_attribute(attr_lazy)
-            device.add_attribute(attr_static)
-
-            client.post_device(device=device)
-            device_res = client.get_device(device_id=device.device_id)
-            self.assertEqual(device.model_dump(exclude={'service',
-                                                        'service_path',
-                                                        'timezone'}),
-                             device_res.model_dump(exclude={'service',
-                                                            'service_path',
-                                                            'timezone'}))
-            self.assertEqual(self.fiware_header.service, device_res.service)
-            self.assertEqual(self.fiware_header.service_path,
-                             device_res.service_path)
-
-    @clean_test(fiware_service=settings.FIWARE_SERVICE,
-                fiware_servicepath=settings.FIWARE_SERVICEPATH,
-                cb_url=settings.CB_URL,
-                iota_url=settings.IOTA_JSON_URL)
+        client = self.client
+        client.get_device_list()
+        device = Device(**self.device)
+
+        # the device gets its own copies of the shared fixtures
+        device.add_attributes([self.attr.model_copy(),
+                               self.attr_command.model_copy(),
+                               self.attr_lazy.model_copy(),
+                               self.attr_static.model_copy()])
+
+        client.post_device(device=device)
+        self._created_devices.append(device)
+        device_res = client.get_device(device_id=device.device_id)
+        expected = device.model_copy(
+            update={field: getattr(device_res, field)
+                    for field in _DEVICE_COMPARE_EXCLUDE})
+        self.assertEqual(expected, device_res)
+        self.assertEqual(self.fiware_header.service, device_res.service)
+        self.assertEqual(self.fiware_header.service_path,
+                         device_res.service_path)
+
     def test_metadata(self):
         """
         Test for metadata works but the api of iot agent-json seems not
@@ -147,25 +168,24 @@ class TestAgent(unittest.TestCase):
         device = Device(**self.device)
         device.device_id = "device_with_meta"
         device.add_attribute(attribute=attr)
-        logger.info(device.model_dump_json(indent=2))
-
-        with IoTAClient(
-                url=settings.IOTA_JSON_URL,
-                fiware_header=self.fiware_header) as client:
-            client.post_device(device=device)
-            logger.info(client.get_device(device_id=device.device_id).model_dump_json(
-                indent=2, exclude_unset=True))
-
-        with ContextBrokerClient(
-                url=settings.CB_URL,
-                fiware_header=self.fiware_header) as client:
-            logger.info(client.get_entity(entity_id=device.entity_name).model_dump_json(
-                indent=2))
-
-    @clean_test(fiware_service=settings.FIWARE_SERVICE,
-                fiware_servicepath=settings.FIWARE_SERVICEPATH,
-                cb_url=settings.CB_URL,
-                iota_url=settings.IOTA_JSON_URL)
+        # only serialize the models if they are actually logged
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info(device.model_dump_json(indent=2))
+
+        client = self.client
+        client.post_device(device=device)
+        self._created_devices.append(device)
+        device_res = client.get_device(device_id=device.device_id)
+        if log_info:
+            logger.info(device_res.model_dump_json(indent=2,
+                                                   exclude_unset=True))
+
+        client = self.cb_client
+        entity = client.get_entity(entity_id=device.entity_name)
+        if log_info:
+            logger.info(entity.model_dump_json(indent=2))
+
     def test_deletions(self):
         """
         Test the deletion of a context entity/device if the state is always
@@ -181,9 +201,12 @@ class TestAgent(unittest.TestCase):
                         protocol='IoTA-JSON',
                         transport='HTTP',
                         apikey='filip-iot-test-device')
+        device2 = copy.deepcopy(device)
+        device2.device_id = "device_id2"
+        # the test removes them itself, this only cleans up after a failure
+        self._created_devices.extend([device, device2])
 
-        cb_client = ContextBrokerClient(url=settings.CB_URL,
-                                        fiware_header=self.fiware_header)
+        cb_client = self.cb_client
 
         # Test 1: Only delete device
         # delete without optional parameter -> entity needs to continue existing
@@ -206,9 +229,6 @@ class TestAgent(unittest.TestCase):
         #        that is linked to multiple devices
         # delete with optional parameter -> entity needs to be deleted
         self.client.post_device(device=device)
-
-        device2 = copy.deepcopy(device)
-        device2.device_id = "device_id2"
         self.client.post_device(device=device2)
         with self.assertRaises(Exception):
             self.client.delete_device(device_id=device_id,
@@ -228,13 +248,15 @@ class TestAgent(unittest.TestCase):
         # Test 5: Delete entity, and all devices
         # # delete with optional parameter -> all devices need to be deleted
         self.client.post_device(device=device)
-        device2 = copy.deepcopy(device)
-        device2.device_id = "device_id2"
         self.client.post_device(device=device2)
         cb_client.delete_entity(entity_id=entity_id, delete_devices=True,
                                 entity_type='Thing2',
                                 iota_url=settings.IOTA_JSON_URL)
-        self.assertEqual(len(self.client.get_device_list()), 0)
+        # only check the devices of this test, since other devices in the
+        # service path are not affected
+        device_ids = {dev.device_id for dev in self.client.get_device_list()}
+        self.assertNotIn(device.device_id, device_ids)
+        self.assertNotIn(device2.device_id, device_ids)
 
     def test_update_device(self):
         """
@@ -255,9 +277,9 @@ class TestAgent(unittest.TestCase):
 
         # use update_device to post
         self.client.update_device(device=device, add=True)
+        self._created_devices.append(device)
 
-        cb_client = ContextBrokerClient(url=settings.CB_URL,
-                                        fiware_header=self.fiware_header)
+        cb_client = self.cb_client
 
         # test if attributes exists correctly
         live_entity = cb_client.get_entity(entity_id=device.entity_name)
@@ -297,8 +319,6 @@ class TestAgent(unittest.TestCase):
         live_device.get_command("Com2")
         live_device.get_attribute("Att2")
 
-        cb_client.close()
-
     def test_patch_device(self):
         """
             Test the methode: patch_device of the iota client
@@ -318,9 +338,9 @@ class TestAgent(unittest.TestCase):
 
         # use patch_device to post
         self.client.patch_device(device=device)
+        self._created_devices.append(device.model_copy())
 
-        cb_client = ContextBrokerClient(url=settings.CB_URL,
-                                        fiware_header=self.fiware_header)
+        cb_client = self.cb_client
 
         # test if attributes exists correctly
         live_entity = cb_client.get_entity(entity_id=device.entity_name)
@@ -374,7 +394,7 @@ class TestAgent(unittest.TestCase):
             live_device = self.client.get_device(device_id=device.device_id)
             self.assertEqual(live_device.__getattribute__(key),
                              new_device.__getattribute__(key))
-            cb_client.close()
+        self._created_devices.append(device)
 
     def test_service_group(self):
         """
@@ -391,6 +411,7 @@ class TestAgent(unittest.TestCase):
                               subservice=settings.FIWARE_SERVICEPATH,
                               resource="/iot/json", apikey="test2")
         self.client.post_groups([group_base, group1, group2], update=True)
+        self._created_groups.extend([group_base, group1, group2])
 
         # get service group
         self.assertEqual(group_base, self.client.get_group(resource="/iot/json", apikey="base"))
@@ -412,6 +433,7 @@ class TestAgent(unittest.TestCase):
                                   attributes=attributes)
 
         self.client.post_group(service_group=group_base)
+        self._created_groups.append(group_base)
         self.assertEqual(group_base, self.client.get_group(resource="/iot/json", apikey="base"))
 
         # # boolean attribute
@@ -432,9 +454,48 @@ class TestAgent(unittest.TestCase):
 
     def tearDown(self) -> None:
         """
-        Cleanup test server
+        Cleanup the devices, their entities and the service groups that were
+        created by the test. Anything that the test already removed itself
+        is skipped.
+        """
+        while self._created_devices:
+            device = self._created_devices.pop()
+            self._cleanup(self.client.delete_device,
+                          device_id=device.device_id)
+            self._cleanup(self.cb_client.delete_entity,
+                          entity_id=device.entity_name,
+                          entity_type=device.entity_type)
+        while self._created_groups:
+            group = self._created_groups.pop()
+            self._cleanup(self.client.delete_group,
+                          resource=group.resource,
+                          apikey=group.apikey)
+
+    @staticmethod
+    def _cleanup(delete: Callable, **kwargs) -> None:
+        """
+        Run a delete request of the cleanup. Failures are logged instead of
+        raised, so that the remaining cleanup still runs.
+        """
+        try:
+            delete(**kwargs)
+        except requests.RequestException as err:
+            if err.response is not None and err.response.status_code == 404:
+                # already removed by the test
+                logger.debug("Cleanup: %s %s not found", delete.__name__,
+                             kwargs)
+            else:
+                logger.warning("Cleanup: %s %s failed: %s", delete.__name__,
+                               kwargs, err)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Cleanup test server and close the shared clients
         """
-        self.client.close()
-        clear_all(fiware_header=self.fiware_header,
+        clear_all(fiware_header=cls.fiware_header,
                   cb_url=settings.CB_URL,
                   iota_url=settings.IOTA_JSON_URL)
+        cls.client.close()
+        cls.cb_client.close()
+        cls.session.close()
@@ -1,4 +1,5 @@
 import logging
+import os
 from uuid import uuid4
 from dotenv import find_dotenv
 from pydantic import AnyUrl, AnyHttpUrl, Field, AliasChoices, model_validator
@@ -82,6 +83,13 @@ class TestSettings(BaseSettings):
         if values.model_dump().get('CI_JOB_ID', None):
             values.FIWARE_SERVICEPATH = f"/{values.CI_JOB_ID}"
 
+        # Separate the tenants of parallel test workers (pytest-xdist) so
+        # that the cleanup of one worker does not affect the others
+        xdist_worker = os.environ.get('PYTEST_XDIST_WORKER', None)
+        if xdist_worker:
+            values.FIWARE_SERVICEPATH = \
+                f"{values.FIWARE_SERVICEPATH}_{xdist_worker}"
+
         # validate header
         FiwareHeader(service=values.FIWARE_SERVICE,
                      service_path=values.FIWARE_SERVICEPATH)
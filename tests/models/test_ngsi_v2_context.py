@@ -1,9 +1,11 @@
 """
 Test module for context broker models
 """
+import json
+import re
 import unittest
 from typing import List
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError, model_validator
 from geojson_pydantic import (
     Point,
     MultiPoint,
@@ -33,8 +35,10 @@ from filip.models.ngsi_v2.context import (
     ContextEntityKeyValues,
     NamedCommand,
     PropertyFormat,
+    _entity_list_adapter,
 )
 from filip.utils.model_generation import create_context_entity_model
+from filip.utils.validators import FiwareRegex
 
 
 class TestContextModels(unittest.TestCase):
@@ -42,18 +46,29 @@ class TestContextModels(unittest.TestCase):
     Test class for context broker models
     """
 
-    def setUp(self) -> None:
+    # attribute names expected after each step of test_entity_delete_attributes
+    EXPECTED_AFTER_DEL1 = frozenset({"test2", "test3"})
+    EXPECTED_AFTER_DEL2 = frozenset({"test3"})
+    EXPECTED_AFTER_DEL3 = frozenset()
+
+    @classmethod
+    def setUpClass(cls) -> None:
         """
-        Setup test data
+        Setup test data and the entity model generated from it. Tests must
+        not modify them.
 
         Returns:
             None
         """
-        self.attr = {"temperature": {"value": 20, "type": "Number"}}
-        self.relation = {"relation": {"value": "OtherEntity", "type": "Relationship"}}
-        self.entity_data = {"id": "MyId", "type": "MyType"}
-        self.entity_data.update(self.attr)
-        self.entity_data.update(self.relation)
+        cls.attr = {"temperature": {"value": 20, "type": "Number"}}
+        cls.relation = {"relation": {"value": "OtherEntity", "type": "Relationship"}}
+        cls.entity_data = {
+            "id": "MyId",
+            "type": "MyType",
+            **cls.attr,
+            **cls.relation,
+        }
+        cls.generated_model = create_context_entity_model(data=cls.entity_data)
 
     def test_cb_attribute(self) -> None:
         """
@@ -75,6 +90,18 @@ class TestContextModels(unittest.TestCase):
         attr = ContextAttribute(**{"value": [20, 20], "type": "Array"})
         self.assertIsInstance(attr.value, list)
 
+    def test_cb_attribute_value_normalization(self) -> None:
+        """
+        Test that structured values are stored as normalized copies
+        """
+        value = {"a": (1, 2), 1: "x"}
+        for attr_type in ("StructuredValue", "Object", "MyType"):
+            attr = ContextAttribute(type=attr_type, value=value)
+            self.assertEqual(attr.value, {"a": [1, 2], "1": "x"})
+            value["a"] = (3, 4)
+            self.assertEqual(attr.value["a"], [1, 2])
+            value["a"] = (1, 2)
+
     def test_geojson_attribute(self):
         """
         Test the GeoJsonAttribute model
@@ -375,9 +402,11 @@ class TestContextModels(unittest.TestCase):
         Returns:
             None
         """
-        md1 = Metadata(type="Text", value="test")
-        md2 = NamedMetadata(name="info", type="Text", value="test")
-        md3 = [NamedMetadata(name="info", type="Text", value="test")]
+        # the inputs are known to be valid, only the conversion of the
+        # metadata formats into each other is tested here
+        md1 = Metadata.model_construct(type="Text", value="test")
+        md2 = NamedMetadata.model_construct(name="info", type="Text", value="test")
+        md3 = [NamedMetadata.model_construct(name="info", type="Text", value="test")]
         attr1 = ContextAttribute(value=20, type="Integer", metadata={"info": md1})
         attr2 = ContextAttribute(**attr1.model_dump(exclude={"metadata"}), metadata=md2)
         attr3 = ContextAttribute(**attr1.model_dump(exclude={"metadata"}), metadata=md3)
@@ -392,8 +421,8 @@ class TestContextModels(unittest.TestCase):
         """
         entity = ContextEntity(**self.entity_data)
         self.assertEqual(self.entity_data, entity.model_dump(exclude_unset=True))
-        entity = ContextEntity.model_validate(self.entity_data)
-        self.assertEqual(self.entity_data, entity.model_dump(exclude_unset=True))
+        # compare the models directly instead of dumping them again
+        self.assertEqual(entity, ContextEntity.model_validate(self.entity_data))
 
         properties = entity.get_properties(response_format="list")
         self.assertEqual(
@@ -434,12 +463,58 @@ class TestContextModels(unittest.TestCase):
             new_attr["new_attr"] = new_attr["new_attr"].model_dump(exclude_unset=True)
             entity.new_attr = new_attr
 
-        # try to generate a model with the entity data
-        generated_model = create_context_entity_model(data=self.entity_data)
-        entity = generated_model(**self.entity_data)
-        self.assertEqual(self.entity_data, entity.model_dump(exclude_unset=True))
-        entity = generated_model.model_validate(self.entity_data)
+        # try to use the model generated with the entity data
+        entity = self.generated_model(**self.entity_data)
         self.assertEqual(self.entity_data, entity.model_dump(exclude_unset=True))
+        self.assertEqual(entity, self.generated_model.model_validate(self.entity_data))
+
+    def test_entity_from_ngsi_dict(self) -> None:
+        """
+        Test the construction of entities from trusted NGSI data
+        Returns:
+            None
+        """
+        entity_data = {
+            "id": "MyId",
+            "type": "MyType",
+            "temperature": {
+                "value": 20.0,
+                "type": "Number",
+                "metadata": {"accuracy": {"value": 0.5, "type": "Number"}},
+            },
+        }
+        entity = ContextEntity(**entity_data)
+        trusted_entity = ContextEntity.from_ngsi_dict(entity_data)
+        self.assertEqual(entity.model_dump(), trusted_entity.model_dump())
+        self.assertIsInstance(
+            trusted_entity.get_attribute("temperature").metadata["accuracy"],
+            Metadata,
+        )
+        self.assertEqual(
+            entity, ContextEntity.from_ngsi_dict(entity_data, trusted=False)
+        )
+
+    def test_entity_parse_list(self) -> None:
+        """
+        Test parsing of json encoded entity lists
+        Returns:
+            None
+        """
+        entities = ContextEntity.parse_list(
+            json.dumps([self.entity_data, {**self.entity_data, "id": "MyId2"}])
+        )
+        self.assertEqual(len(entities), 2)
+        self.assertEqual(entities[0], ContextEntity(**self.entity_data))
+        self.assertEqual(entities[1].id, "MyId2")
+
+        # subclasses, e.g. generated models, are parsed into their own class
+        entities = self.generated_model.parse_list(json.dumps([self.entity_data]))
+        self.assertIsInstance(entities[0], self.generated_model)
+        self.assertEqual(entities[0], self.generated_model(**self.entity_data))
+        # the adapter of a class is only built once
+        misses = _entity_list_adapter.cache_info().misses
+        self.generated_model.parse_list(json.dumps([self.entity_data]))
+        self.assertEqual(_entity_list_adapter.cache_info().misses, misses)
 
     def test_command(self):
         """
@@ -477,58 +552,107 @@ class TestContextModels(unittest.TestCase):
         Returns:
             None
         """
-
-        from pydantic.error_wrappers import ValidationError
-
         valid_strings: List[str] = ["name", "test123", "3_:strange-Name!"]
         invalid_strings: List[str] = ["my name", "Test?", "#False", "/notvalid"]
 
         special_strings: List[str] = ["id", "type", "geo:location"]
 
-        # Test if all needed fields, detect all invalid strings
-        for string in invalid_strings:
-            self.assertRaises(ValidationError, Metadata, type=string)
-            self.assertRaises(ValidationError, NamedMetadata, name=string)
-            self.assertRaises(ValidationError, ContextAttribute, type=string)
-            self.assertRaises(ValidationError, NamedContextAttribute, name=string)
-            self.assertRaises(
-                ValidationError, ContextEntityKeyValues, id=string, type="name"
-            )
-            self.assertRaises(
-                ValidationError, ContextEntityKeyValues, id="name", type=string
+        standard = re.compile(FiwareRegex.standard.value)
+        string_protect = re.compile(FiwareRegex.string_protect.value)
+        # FIWARE safe fields, the regex they are validated with and other
+        # arguments their model requires
+        safe_fields = [
+            (Metadata, "type", standard, {}),
+            (NamedMetadata, "name", standard, {}),
+            (ContextAttribute, "type", string_protect, {}),
+            (NamedContextAttribute, "name", string_protect, {}),
+            (ContextEntityKeyValues, "id", standard, {"type": "name"}),
+            (ContextEntityKeyValues, "type", standard, {"id": "name"}),
+            (NamedCommand, "name", string_protect, {"value": "name"}),
+        ]
+
+        # Test if the regexes detect all invalid strings and do not reject
+        # valid ones
+        # Cases of (string, matches standard, matches string_protect).
+        # Special strings are blocked by the string protected regex only.
+        cases = (
+            [(string, False, False) for string in invalid_strings]
+            + [(string, True, True) for string in valid_strings]
+            + [(string, True, False) for string in special_strings]
+        )
+        for string, is_standard, is_protected in cases:
+            with self.subTest(string=string):
+                self.assertEqual(standard.match(string) is not None, is_standard)
+                self.assertEqual(
+                    string_protect.match(string) is not None, is_protected
+                )
+
+        # Test if all needed fields are validated with their regex. All
+        # strings are validated in one go and the rejected ones are
+        # collected from the errors of the list items.
+        strings = invalid_strings + valid_strings + special_strings
+        for model, field, pattern, kwargs in safe_fields:
+            expected = set(invalid_strings)
+            if pattern is string_protect:
+                expected.update(special_strings)
+            adapter = TypeAdapter(List[model])
+            with self.subTest(model=model.__name__, field=field):
+                try:
+                    adapter.validate_python(
+                        [{**kwargs, field: string} for string in strings]
+                    )
+                    rejected = set()
+                except ValidationError as err:
+                    rejected = {strings[error["loc"][0]] for error in err.errors()}
+                self.assertEqual(expected, rejected)
+
+    def test_entity_add_attributes(self):
+        """
+        Test that add_attributes validates the attributes and the entity
+        """
+        entity = ContextEntity(id="12", type="Test")
+        entity.add_attributes(
+            {
+                "test1": ContextAttribute(value=20, type="Integer"),
+                "test2": ContextAttribute(value=20, type="Integer"),
+            }
+        )
+        self.assertEqual(entity.get_attribute_names(), {"test1", "test2"})
+
+        # attributes must not be passed as plain dicts
+        with self.assertRaises(ValidationError):
+            entity.add_attributes({"test3": {"value": 20, "type": "Integer"}})
+
+        # the validators of the entity still run, if they fail no attribute
+        # is added
+        class LimitedEntity(ContextEntity):
+            @model_validator(mode="after")
+            def check_attribute_count(self):
+                if len(self.model_extra) > 2:
+                    raise ValueError("too many attributes")
+                return self
+
+        entity = LimitedEntity(id="12", type="Test")
+        with self.assertRaises(ValidationError):
+            entity.add_attributes(
+                {
+                    "test1": ContextAttribute(value=20, type="Integer"),
+                    "test2": ContextAttribute(value=20, type="Integer"),
+                    "test3": ContextAttribute(value=20, type="Integer"),
+                }
             )
-            self.assertRaises(ValidationError, NamedCommand, name=string)
-
-        # Test if all needed fields, do not trow wrong errors
-        for string in valid_strings:
-            Metadata(type=string)
-            NamedMetadata(name=string)
-            ContextAttribute(type=string)
-            NamedContextAttribute(name=string)
-            ContextEntityKeyValues(id=string, type=string)
-            NamedCommand(name=string, value=string)
-
-        # Test for the special-string protected field if all strings are blocked
-        for string in special_strings:
-            self.assertRaises(ValidationError, ContextAttribute, type=string)
-            self.assertRaises(ValidationError, NamedContextAttribute, name=string)
-            self.assertRaises(ValidationError, NamedCommand, name=string)
-        # Test for the normal protected field if all strings are allowed
-        for string in special_strings:
-            Metadata(type=string)
-            NamedMetadata(name=string)
-            ContextEntityKeyValues(id=string, type=string)
+        self.assertEqual(entity.get_attribute_names(), set())
 
     def test_entity_delete_attributes(self):
         """
         Test the delete_attributes methode
         also tests the get_attribute_name method
         """
-        attr = ContextAttribute(**{"value": 20, "type": "Text"})
-        named_attr = NamedContextAttribute(
+        attr = ContextAttribute.model_construct(**{"value": 20, "type": "Text"})
+        named_attr = NamedContextAttribute.model_construct(
             **{"name": "test2", "value": 20, "type": "Text"}
         )
-        attr3 = ContextAttribute(**{"value": 20, "type": "Text"})
+        attr3 = ContextAttribute.model_construct(**{"value": 20, "type": "Text"})
 
         entity = ContextEntity(id="12", type="Test")
 
@@ -536,13 +660,13 @@ class TestContextModels(unittest.TestCase):
         entity.add_attributes([named_attr])
 
         entity.delete_attributes({"test1": attr})
-        self.assertEqual(entity.get_attribute_names(), {"test2", "test3"})
+        self.assertSetEqual(entity.get_attribute_names(), self.EXPECTED_AFTER_DEL1)
 
         entity.delete_attributes([named_attr])
-        self.assertEqual(entity.get_attribute_names(), {"test3"})
+        self.assertSetEqual(entity.get_attribute_names(), self.EXPECTED_AFTER_DEL2)
 
         entity.delete_attributes(["test3"])
-        self.assertEqual(entity.get_attribute_names(), set())
+        self.assertSetEqual(entity.get_attribute_names(), self.EXPECTED_AFTER_DEL3)
 
     def test_entity_get_command_methods(self):
         """
@@ -608,6 +732,42 @@ class TestContextModels(unittest.TestCase):
                 {"myCommand", "myCommand2"},
             )
 
+    def test_get_attributes_copies(self):
+        """
+        Test that the attributes returned by get_attributes and get_attribute
+        are independent of the entity
+        """
+        entity = ContextEntity(
+            id="12",
+            type="Test",
+            temperature={
+                "value": 20,
+                "type": "Number",
+                "metadata": {"accuracy": {"type": "Text", "value": "+-5%"}},
+            },
+            list_attr={"value": [1, 2], "type": "StructuredValue"},
+        )
+        attrs = entity.get_attributes(response_format=PropertyFormat.DICT)
+        attrs["temperature"].metadata["new"] = Metadata(type="Text", value="x")
+        attrs["temperature"].metadata["accuracy"].value = "+-1%"
+        attrs["list_attr"].value.append(3)
+        named_attrs = entity.get_attributes()
+        named_attrs[1].value.append(4)
+
+        entity.get_attribute("list_attr").value.append(5)
+        entity.get_attribute("temperature").metadata.clear()
+
+        self.assertEqual(set(entity.temperature.metadata), {"accuracy"})
+        self.assertEqual(entity.temperature.metadata["accuracy"].value, "+-5%")
+        self.assertEqual(entity.list_attr.value, [1, 2])
+
+        named_attr = NamedContextAttribute(
+            name="s", type="StructuredValue", value={"a": 1}
+        )
+        entity.add_attributes([named_attr])
+        named_attr.value["a"] = 2
+        self.assertEqual(entity.s.value, {"a": 1})
+
     def test_get_attributes(self):
         """
         Test the get_attributes method
@@ -10,7 +10,8 @@ import pyjexl
 
 from filip.models.base import FiwareHeader
 from filip.models.ngsi_v2.iot import DeviceCommand, ServiceGroup, \
-    Device, TransportProtocol, IoTABaseAttribute, ExpressionLanguage, PayloadProtocol, DeviceAttribute
+    Device, TransportProtocol, IoTABaseAttribute, ExpressionLanguage, PayloadProtocol, DeviceAttribute, \
+    LazyDeviceAttribute, StaticDeviceAttribute
 from filip.clients.ngsi_v2 import ContextBrokerClient, IoTAClient
 
 from filip.utils.cleanup import clear_all, clean_test
@@ -117,6 +118,32 @@ class TestContextv2IoTModels(unittest.TestCase):
             Device(device_id="", entity_name=string, entity_type=string,
                    transport=TransportProtocol.HTTP)
 
+    def test_add_attributes(self):
+        """
+        Test adding several attributes to a device at once
+        """
+        device = Device(device_id="test_device",
+                        entity_name="test_entity",
+                        entity_type="test_entity_type")
+        attr = DeviceAttribute(name="temperature", type="Number")
+        command = DeviceCommand(name="open")
+        lazy = LazyDeviceAttribute(name="pressure", type="Text")
+        static = StaticDeviceAttribute(name="hasRoom", type="Relationship",
+                                       value="my_partner_id")
+        device.add_attributes([attr, command, lazy, static])
+        self.assertEqual(device.attributes, [attr])
+        self.assertEqual(device.commands, [command])
+        self.assertEqual(device.lazy, [lazy])
+        self.assertEqual(device.static_attributes, [static])
+
+        # attributes before an existing one are still added
+        attr2 = DeviceAttribute(name="humidity", type="Number")
+        with self.assertRaises(ValueError):
+            device.add_attributes([attr2, attr])
+        self.assertEqual(device.attributes, [attr, attr2])
+        device.add_attributes([attr], update=True)
+        self.assertEqual(device.attributes, [attr, attr2])
+
     @clean_test(fiware_service=settings.FIWARE_SERVICE,
                 fiware_servicepath=settings.FIWARE_SERVICEPATH,
                 cb_url=settings.CB_URL,
@@ -0,0 +1,57 @@
+"""
+Tests for the model generation in filip.utils.model_generation
+"""
+import unittest
+from pydantic import field_validator
+from filip.models.ngsi_v2.context import ContextEntity
+from filip.utils.model_generation import create_context_entity_model
+
+
+class TestModelGeneration(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.data = {"id": "MyId",
+                     "type": "MyType",
+                     "temperature": {"value": 20, "type": "Number"}}
+
+    def test_create_context_entity_model_cache(self):
+        model = create_context_entity_model(name="CachedModel",
+                                            data=self.data)
+        self.assertTrue(issubclass(model, ContextEntity))
+        # same name and attribute names return the same class
+        self.assertIs(model,
+                      create_context_entity_model(
+                          name="CachedModel",
+                          data={**self.data, "id": "OtherId"}))
+        # other attributes or another name give another class
+        self.assertIsNot(model,
+                         create_context_entity_model(
+                             name="CachedModel",
+                             data={**self.data,
+                                   "humidity": {"value": 50,
+                                                "type": "Number"}}))
+        self.assertIsNot(model,
+                         create_context_entity_model(name="OtherModel",
+                                                     data=self.data))
+
+    def test_create_context_entity_model_validators(self):
+        def check_temperature(cls, value):
+            assert value.value < 100, "too hot"
+            return value
+
+        validators = {"check_temperature": field_validator("temperature")(
+            check_temperature)}
+        model = create_context_entity_model(name="ValidatedModel",
+                                            data=self.data,
+                                            validators=validators)
+        # models with validators are not cached
+        self.assertIsNot(model,
+                         create_context_entity_model(name="ValidatedModel",
+                                                     data=self.data,
+                                                     validators=validators))
+        self.assertIsNot(model,
+                         create_context_entity_model(name="ValidatedModel",
+                                                     data=self.data))
+        with self.assertRaises(ValueError):
+            model(**{**self.data,
+                     "temperature": {"value": 120, "type": "Number"}})
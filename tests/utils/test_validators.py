@@ -0,0 +1,28 @@
+"""
+Tests for the helper functions in filip.utils.validators
+"""
+import unittest
+from filip.utils.validators import is_json_serializable
+
+
+class TestValidators(unittest.TestCase):
+
+    def test_is_json_serializable(self):
+        # primitives
+        for value in [None, "text", 1, 1.5, True]:
+            self.assertTrue(is_json_serializable(value))
+
+        # nested containers
+        self.assertTrue(is_json_serializable(
+            {"list": [1, "a", None, {"nested": (1.0, False)}], "empty": {}}))
+        self.assertFalse(is_json_serializable({"list": [1, {"set": {1}}]}))
+
+        # keys that json.dumps accepts are allowed, others are rejected
+        self.assertTrue(is_json_serializable({1: "a", None: "b", 1.5: "c",
+                                              True: "d"}))
+        self.assertFalse(is_json_serializable({(1, 2): "a"}))
+
+        # objects that cannot be serialized
+        self.assertFalse(is_json_serializable(object()))
+        self.assertFalse(is_json_serializable(b"bytes"))
+        self.assertFalse(is_json_serializable([1, 2, {3, 4}]))